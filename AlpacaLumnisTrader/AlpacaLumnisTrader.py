@@ -1,4 +1,4 @@
-from .utils import standardize, getDailyVol
+from .utils import standardize, getDailyVol, _daily_vol_last, _last_zscore
 
 from lumnisfactors import LumnisFactors
 
@@ -13,7 +13,11 @@ from alpaca.trading.requests import MarketOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce
 from alpaca.trading.requests import TakeProfitRequest, StopLossRequest
 
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from requests.adapters import HTTPAdapter
+from hashlib import sha256
+from pathlib import Path
 from tqdm import tqdm
 import pandas as pd
 import numpy as np
@@ -47,34 +51,73 @@ class AlpacaLumnisTrader():
             Time frame of sample observations.
             One of 'min' or 'hour'
 
+        poll_interval : int, default=60
+            Seconds between wake-ups of the trading loop.
+            The loop sleeps until the next interval boundary instead of polling.
+
+        cache_dir : str, default='lumnis_cache'
+            Directory used to cache warmup downloads on disk so restarts
+            skip refetching the full history.
+
     Attributes
     ----------
     """
-    def __init__(self, binance_api_key, binance_secret_key, lumnis_api_key, factors, coins, paper=True, time_frame="min"):
+    def __init__(self, binance_api_key, binance_secret_key, lumnis_api_key, factors, coins, paper=True, time_frame="min", poll_interval=60, cache_dir="lumnis_cache"):
 
         self.trading_client  = TradingClient(binance_api_key, binance_secret_key, paper=paper)
+
+        ## reuse keep-alive connections across the concurrent REST calls so
+        ## each minute tick does not pay for fresh TLS handshakes
+        session = getattr(self.trading_client, "_session", None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            session.mount("https://", adapter)
+
+        self.ACCOUNT_TTL     = 30
+        self.ASSETS_TTL      = 3600
+        self._account_cache  = (0.0, None)
+        self._assets_cache   = (0.0, None)
+
         self.tradable_assets = self.get_tradable_assets(coins)
         self.time_frame      = time_frame
+        self.poll_interval   = poll_interval
         self.lumnisfactors   = LumnisFactors(lumnis_api_key)
         self.factors         = factors
 
         self.tp              = 2
         self.sl              = 2
         self.ALPACA_TC       = 0.0015
-
-        self.asset_meta_data = {}
-        for asset in self.tradable_assets:
-            self.asset_meta_data[asset.symbol] = {
-                "min_order_size"     : asset.min_order_size,
-                "current_ret"        : 0,
-                "take_profit"        : 0,
-                "stop_loss"          : 0,
-                "stop_loss_percent"  : 0,
-                "take_profit_percent": 0,
-                "price_at_excexution": 0,
-                "qty"                : 0,
+        self.HISTORY_ROWS    = 10000
+        self.PRICE_ROWS      = 2880
+        self.used_cols       = {'vpin_500', 'close'}
+
+        self._pool           = ThreadPoolExecutor(max_workers=max(16, 2 * len(self.tradable_assets)))
+
+        self.cache_dir       = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_hits      = 0
+        self.cache_misses    = 0
+        self._purge_stale_cache()
+
+        ## per-symbol state lives in one typed frame (structure of arrays)
+        ## so bulk reads and future vectorized exposure checks stay cheap
+        self.asset_meta_data = pd.DataFrame({
+                "alpaca_symbol"      : [asset.symbol.replace("/", "") for asset in self.tradable_assets],
+                "min_order_size"     : [asset.min_order_size for asset in self.tradable_assets],
+                "current_ret"        : 0.0,
+                "take_profit"        : 0.0,
+                "stop_loss"          : 0.0,
+                "stop_loss_percent"  : 0.0,
+                "take_profit_percent": 0.0,
+                "price_at_excexution": 0.0,
+                "qty"                : 0.0,
                 "side"               : 0
-            }
+            }, index=[asset.symbol for asset in self.tradable_assets])
+
+        self._n_assets       = len(self.tradable_assets)
+        self._vol_floor      = self.ALPACA_TC * 15
+        self._alpaca_symbols = self.asset_meta_data['alpaca_symbol'].to_dict()
+        self._asset_tuples   = list(self.asset_meta_data['min_order_size'].items())
 
         start_time           = time.time()
         self.history         = self.warmup_history()
@@ -84,12 +127,13 @@ class AlpacaLumnisTrader():
         self.update_history()
         print("Update time: ", (time.time() - start_time) /60, "min")
 
-        self.MINUTE_CONDITION    = lambda interval, last_min : datetime.now().second  == interval and datetime.now().minute != last_min
-    
 
     def run(self):
         """Runs the live trader.
 
+        Sleeps until the next `poll_interval` boundary instead of busy-waiting,
+        so the process stays idle between ticks.
+
         Parameters
         ----------
             None
@@ -99,48 +143,75 @@ class AlpacaLumnisTrader():
             None
 
         """
-        last_min = datetime.now().minute
+        ## next boundary is always computed from the current time, so the
+        ## loop can never fire twice inside one interval
+        next_tick = (int(time.time()) // self.poll_interval + 1) * self.poll_interval
         while True:
-            ## TODO: check if minutes is 00
-            if self.MINUTE_CONDITION(0, last_min):
-            
-                account      = self.trading_client.get_account()
-                account_cash = float( account.cash ) * 0.9
-                cash_asset   = int( account_cash / len(self.tradable_assets) )
-                side         = OrderSide.BUY
+            time.sleep(max(next_tick - time.time(), 0.0))
 
-                try:
-                    self.update_history(50)
-                except:
-                    print("Error updating history")
-                    continue
-                
-                for asset in self.tradable_assets:
-                    symbol      = asset.symbol
-                    qty         = cash_asset / self.price_history[symbol].iloc[-1].close 
-                    pos         = self.get_open_position(symbol)
-                    if pos: continue
-
-                    signal    = self.get_signal(symbol)
-        
-                    if self.asset_meta_data[asset.symbol]['min_order_size'] > qty:    continue 
+            account      = self.get_account()
+            account_cash = float( account.cash ) * 0.9
+            cash_asset   = int( account_cash / self._n_assets )
+
+            try:
+                self.update_history(50)
+            except:
+                print("Error updating history")
+                next_tick = (int(time.time()) // self.poll_interval + 1) * self.poll_interval
+                continue
+
+            list(self._pool.map(partial(self._handle_asset, cash_asset=cash_asset), self._asset_tuples))
+
+            next_tick = (int(time.time()) // self.poll_interval + 1) * self.poll_interval
 
-                    vol       = getDailyVol(self.price_history[symbol]['close'], 60)
-                    vol       = vol.iloc[-1]
-                    vol       = min( vol, 0.1)
-                    vol       = max(vol, self.ALPACA_TC*15)
+    def _handle_asset(self, asset_tuple, cash_asset):
+        """Evaluates one asset at the minute boundary and submits its order.
 
-                    close     = self.price_history[symbol].iloc[-1].close
+        Runs on the worker pool so the per-asset Alpaca round trips overlap
+        instead of executing back to back.
 
-                    if signal == 1:
-                        take_profit = close + (self.tp * vol * close) 
-                        stop_loss   = close - (self.sl * vol * close) 
+        Parameters
+        ----------
+            asset_tuple : tuple
+                (symbol, min_order_size) pair precomputed in __init__
 
-                        order = self.submit_order(symbol, qty, side, take_profit=take_profit, stop_loss=stop_loss)
-                        # print(order)
-                        print("BUY ", symbol, " at ", close, " with ", qty, " shares", " TP: ", take_profit, " SL: ", stop_loss)
+            cash_asset : int
+                Cash allocated to this asset for the current tick
 
-                last_min = datetime.now().minute
+        Returns
+        -------
+            None
+
+        """
+        symbol, min_order_size = asset_tuple
+
+        side        = OrderSide.BUY
+        qty         = cash_asset / self.price_history[symbol].iloc[-1].close
+        pos         = self.get_open_position(symbol)
+        if pos: return
+
+        ## cheap filters first: only compute the signal for assets we
+        ## could actually order
+        if min_order_size > qty:    return
+
+        signal    = self.get_signal(symbol)
+
+        ## the kernel expects nanosecond timestamps; pandas 3 builds
+        ## microsecond-resolution indexes, so normalize the unit explicitly
+        close_hist = self.price_history[symbol]['close']
+        vol       = _daily_vol_last(close_hist.index.as_unit("ns").asi8, close_hist.to_numpy(dtype=np.float64), 60)
+        vol       = min( vol, 0.1)
+        vol       = max(vol, self._vol_floor)
+
+        close     = self.price_history[symbol].iloc[-1].close
+
+        if signal == 1:
+            take_profit = close + (self.tp * vol * close)
+            stop_loss   = close - (self.sl * vol * close)
+
+            order = self.submit_order(symbol, qty, side, take_profit=take_profit, stop_loss=stop_loss)
+            # print(order)
+            print("BUY ", symbol, " at ", close, " with ", qty, " shares", " TP: ", take_profit, " SL: ", stop_loss)
 
     def get_signal(self, symbol, strat='macd'):
         """Get trading signal. The core of the strategy.
@@ -158,11 +229,10 @@ class AlpacaLumnisTrader():
         
         """
         raw_df  = self.history[symbol]
-        df      = standardize(raw_df, 10000)
 
         if strat == 'macd':
-            signal = (df['vpin_500'].iloc[-1] > 2) * 1
-            return signal
+            z_score = _last_zscore(raw_df['vpin_500'].to_numpy(dtype=np.float64), 10000)
+            return int(z_score > 2)
 
         return 0
 
@@ -180,14 +250,8 @@ class AlpacaLumnisTrader():
                 The assets to be traded in the strategy
         
         """
-        all_assets_alpaca = self.get_all_assets()
-        tradable_assets   = []
-
-        for asset in all_assets_alpaca:
-            for coin in coins:
-                if coin == asset.symbol:
-                    tradable_assets.append(asset)
-        return tradable_assets
+        coin_set = frozenset(coins)
+        return [asset for asset in self.get_all_assets() if asset.symbol in coin_set]
     
     def get_all_assets(self):        
         """Gets all assets from Alpaca.
@@ -200,10 +264,14 @@ class AlpacaLumnisTrader():
         -------
             (unnamed) : TradingClient
                 Alpaca trading client containing all assets
-        
+
         """
-        search_params     = GetAssetsRequest(asset_class=AssetClass.CRYPTO)
-        return self.trading_client.get_all_assets(search_params)
+        fetched_at, assets = self._assets_cache
+        if assets is None or time.time() - fetched_at > self.ASSETS_TTL:
+            search_params      = GetAssetsRequest(asset_class=AssetClass.CRYPTO)
+            assets             = self.trading_client.get_all_assets(search_params)
+            self._assets_cache = (time.time(), assets)
+        return assets
     
     def get_account(self):
         """Gets Alpaca trading account.
@@ -215,10 +283,14 @@ class AlpacaLumnisTrader():
         Returns
         -------
             (unnnamed) : TradingClient.get_account()
-                Alpaca trading client's account
-        
+                Alpaca trading client's account, cached for ACCOUNT_TTL seconds
+
         """
-        return self.trading_client.get_account()
+        fetched_at, account = self._account_cache
+        if account is None or time.time() - fetched_at > self.ACCOUNT_TTL:
+            account             = self.trading_client.get_account()
+            self._account_cache = (time.time(), account)
+        return account
 
     def get_all_positions(self):
         """Gets all positions from Alpaca.
@@ -273,18 +345,39 @@ class AlpacaLumnisTrader():
         try:
             order = self.trading_client.submit_order(order_data=market_order_data)
 
-            # self.asset_meta_data[symbol]['invested'] = True
-            # self.asset_meta_data[symbol]['price_at_excexution'] = close
-            # self.asset_meta_data[symbol]['qty'] = qty
-            # self.asset_meta_data[symbol]['side'] = side
-            # self.asset_meta_data[symbol]['take_profit'] = take_profit
-            # self.asset_meta_data[symbol]['stop_loss'] = stop_loss
+            # self.asset_meta_data.at[symbol, 'price_at_excexution'] = close
+            # self.asset_meta_data.at[symbol, 'qty'] = qty
+            # self.asset_meta_data.at[symbol, 'side'] = side
+            # self.asset_meta_data.at[symbol, 'take_profit'] = take_profit
+            # self.asset_meta_data.at[symbol, 'stop_loss'] = stop_loss
 
             return order
         except Exception as e:
             print(e)
             return False
     
+    def _alpaca_symbol(self, symbol):
+        """Resolves a symbol to its slash-less Alpaca form.
+
+        Uses the form precomputed in asset_meta_data when available so the
+        hot loop avoids allocating a new string per call.
+
+        Parameters
+        ----------
+            symbol : str
+                Symbol to resolve, e.g. 'BTC/USD'
+
+        Returns
+        -------
+            (unnamed) : str
+                The symbol without the slash, e.g. 'BTCUSD'
+
+        """
+        alpaca_symbol = self._alpaca_symbols.get(symbol)
+        if alpaca_symbol is not None:
+            return alpaca_symbol
+        return symbol.replace("/", "")
+
     def get_open_position(self, symbol):
         """Get an open position for a given symbol.
 
@@ -301,7 +394,7 @@ class AlpacaLumnisTrader():
         
         """
         try:
-            return self.trading_client.get_open_position(symbol.replace("/", ""))
+            return self.trading_client.get_open_position(self._alpaca_symbol(symbol))
         except Exception as e:
             return False
 
@@ -342,7 +435,7 @@ class AlpacaLumnisTrader():
         
         """
         try:
-            return self.trading_client.close_position(symbol.replace("/", ""))
+            return self.trading_client.close_position(self._alpaca_symbol(symbol))
         except Exception as e:
             print(e)
             return False
@@ -379,13 +472,22 @@ class AlpacaLumnisTrader():
                 Dataframe containing asset history
         
         """
-        history = {}
+        start, today = self._history_range()
+        freq         = "1min" if self.time_frame == "min" else "1h"
+        master_idx   = pd.date_range(start, today, freq=freq, tz="UTC")
+
+        futures = {}
         for asset in self.tradable_assets:
-            data = []
-            for factor in tqdm(self.factors):
-                df_hist         = self.get_history(factor, asset)
-                data.append(df_hist)
-            history[asset.symbol] = pd.concat(data, axis=1).fillna(method='ffill')
+            futures[asset.symbol] = [self._pool.submit(self.get_history, factor, asset) for factor in self.factors]
+
+        history = {}
+        for symbol, asset_futures in tqdm(futures.items()):
+            ## reindex each factor onto the shared grid so concat sees
+            ## aligned indexes and skips the O(T log T) index union
+            data            = [future.result().reindex(master_idx) for future in asset_futures]
+            frame           = pd.concat(data, axis=1, copy=False)
+            frame.ffill(inplace=True)
+            history[symbol] = frame
 
         return history
 
@@ -402,12 +504,32 @@ class AlpacaLumnisTrader():
                 Dataframe containing price history
         
         """
+        futures = {asset.symbol: self._pool.submit(self.get_history, 'price', asset) for asset in self.tradable_assets}
+
         history = {}
-        for asset in self.tradable_assets:
-            df_hist         = self.get_history('price', asset)
-            history[asset.symbol] = df_hist.fillna(method='ffill')
+        for symbol, future in futures.items():
+            frame           = future.result()
+            frame.ffill(inplace=True)
+            history[symbol] = frame
         return history
     
+    def _history_range(self):
+        """Date range used for warmup downloads.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            (start, today) : tuple of str
+                Start and end dates formatted as '%Y-%m-%d'
+
+        """
+        today = pd.to_datetime("today") - pd.Timedelta(days=1.5)
+        start = today - pd.Timedelta(days=80)
+        return start.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+
     def get_history(self, factor, asset):
         """Gets price history for an asset and factor
 
@@ -425,18 +547,201 @@ class AlpacaLumnisTrader():
                 Dataframe containing history for asset and factor
         
         """
-        today = pd.to_datetime("today") - pd.Timedelta(days=1.5)
-        start = today - pd.Timedelta(days=80)
-        
-        today = today.strftime("%Y-%m-%d")
-        start = start.strftime("%Y-%m-%d")
+        start, today = self._history_range()
 
-        df_hist         = self.lumnisfactors.get_historical_data(factor, "binance", asset.symbol.replace("/", ""),  self.time_frame, start, today)
+        df_hist         = self._get_or_fetch(factor, self._alpaca_symbol(asset.symbol), start, today)
         df_hist.index   = pd.to_datetime(df_hist.index, utc=True)
         df_hist         = df_hist[~df_hist.index.duplicated(keep='first')]
 
-        return df_hist
+        return self._downcast_floats(self._project_used_cols(df_hist))
     
+    def _downcast_floats(self, df):
+        """Downcasts float64 columns to float32.
+
+        The signal path only performs threshold comparisons, so float32
+        precision is sufficient and halves the bytes moved per pandas op.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                Dataframe to downcast
+
+        Returns
+        -------
+            df : pd.DataFrame
+                Dataframe with float columns stored as float32
+
+        """
+        float_cols = df.select_dtypes('float64').columns
+        if len(float_cols):
+            df = df.astype({col: 'float32' for col in float_cols}, copy=False)
+        return df
+
+    def _project_used_cols(self, df):
+        """Keeps only the columns the strategy actually consumes.
+
+        Frames whose columns are all unused (e.g. factors kept for future
+        strategies) are returned untouched.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                Dataframe to project
+
+        Returns
+        -------
+            df : pd.DataFrame
+                Dataframe restricted to used_cols where possible
+
+        """
+        keep = [col for col in df.columns if col in self.used_cols]
+        if keep:
+            return df[keep]
+        return df
+
+    def _fetch_factor_live(self, symbol, lookback):
+        """Fetches live factor data for a symbol from Lumnis.
+
+        Parameters
+        ----------
+            symbol : str
+                Alpaca-style symbol without the slash
+
+            lookback : int
+                Lookback period in minutes
+
+        Returns
+        -------
+            df_live : pd.DataFrame
+                Dataframe containing live factor data
+
+        """
+        df_live         = self.lumnisfactors.get_multifactor_live_data(self.factors, "binance", symbol, self.time_frame, lookback)
+        df_live.index   = pd.to_datetime(df_live.index, utc=True)
+        return self._downcast_floats(self._project_used_cols(df_live))
+
+    def _fetch_price_live(self, symbol, lookback):
+        """Fetches live price data for a symbol from Lumnis.
+
+        Parameters
+        ----------
+            symbol : str
+                Alpaca-style symbol without the slash
+
+            lookback : int
+                Lookback period in minutes
+
+        Returns
+        -------
+            df_live : pd.DataFrame
+                Dataframe containing live price data
+
+        """
+        df_live         = self.lumnisfactors.get_live_data('price', "binance", symbol, self.time_frame, lookback)
+        df_live.index   = pd.to_datetime(df_live.index, utc=True)
+        return self._downcast_floats(self._project_used_cols(df_live))
+
+    def _purge_stale_cache(self):
+        """Deletes cache entries whose end date precedes the current range.
+
+        Cache filenames are prefixed with their end date, so files written
+        for earlier ranges can be unlinked without opening them. Keeps the
+        cache directory bounded on long-lived deployments.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        -------
+            None
+
+        """
+        _, today = self._history_range()
+        for path in self.cache_dir.glob("*.parquet"):
+            end_date = path.name.split("_", 1)[0]
+            if len(end_date) == len(today) and end_date < today:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    print(e)
+
+    def _get_or_fetch(self, factor, symbol, start, today):
+        """Reads a warmup download from the disk cache, fetching on a miss.
+
+        Entries are stored as <end date>_<key hash>.parquet: the end date in
+        the name keys the lookup to the current range and lets
+        _purge_stale_cache delete expired files.
+
+        Parameters
+        ----------
+            factor : str
+                Factor to get history of
+
+            symbol : str
+                Alpaca-style symbol without the slash
+
+            start : str
+                Start date formatted as '%Y-%m-%d'
+
+            today : str
+                End date formatted as '%Y-%m-%d'
+
+        Returns
+        -------
+            df_hist : pd.DataFrame
+                Dataframe containing history for the symbol and factor
+
+        """
+        key  = "_".join([factor, symbol, self.time_frame, start, today])
+        path = self.cache_dir / (today + "_" + sha256(key.encode()).hexdigest() + ".parquet")
+
+        if path.exists():
+            self.cache_hits   += 1
+            return pd.read_parquet(path)
+
+        self.cache_misses += 1
+        df_hist = self.lumnisfactors.get_historical_data(factor, "binance", symbol, self.time_frame, start, today)
+        try:
+            df_hist.to_parquet(path)
+        except Exception as e:
+            print(e)
+        return df_hist
+
+    def _append_new_rows(self, old, new, max_rows):
+        """Appends only the rows of `new` dated after the end of `old`.
+
+        Both frames arrive sorted from the API, so one binary search finds
+        the first genuinely new timestamp; overlapping rows keep the old
+        values, matching the previous duplicated(keep='first') behaviour
+        without deduplicating or re-sorting the merged frame.
+
+        Parameters
+        ----------
+            old : pd.DataFrame
+                Existing history frame, sorted by timestamp
+
+            new : pd.DataFrame
+                Freshly fetched frame, sorted by timestamp
+
+            max_rows : int
+                Number of trailing rows to retain
+
+        Returns
+        -------
+            (unnamed) : pd.DataFrame
+                Merged frame truncated to the trailing max_rows
+
+        """
+        if len(old) == 0:
+            return new.iloc[-max_rows:]
+
+        cut = np.searchsorted(new.index.values, old.index.values[-1], side='right')
+        if cut >= len(new):
+            return old.iloc[-max_rows:]
+
+        return pd.concat([old, new.iloc[cut:]], copy=False).iloc[-max_rows:]
+
     def update_history(self, lookback=2880):
         """
 
@@ -448,19 +753,15 @@ class AlpacaLumnisTrader():
         Returns
         -------
             None
-        
+
         """
+        futures = []
         for asset in self.tradable_assets:
-            symbol                            = asset.symbol.replace("/", "")
-
-            df_live                           = self.lumnisfactors.get_multifactor_live_data(self.factors, "binance", symbol, self.time_frame, lookback)
-            df_live.index                     = pd.to_datetime(df_live.index, utc=True)
-
-            self.history[asset.symbol]        = pd.concat([self.history[asset.symbol], df_live], axis=0)
-            self.history[asset.symbol]        = self.history[asset.symbol][~self.history[asset.symbol].index.duplicated(keep='first')].sort_index()
-                    
-            df_live                           = self.lumnisfactors.get_live_data('price', "binance", symbol, self.time_frame, lookback)
-            df_live.index                     = pd.to_datetime(df_live.index, utc=True)
-        
-            self.price_history[asset.symbol]  = pd.concat([self.price_history[asset.symbol], df_live], axis=0)
-            self.price_history[asset.symbol]  = self.price_history[asset.symbol][~self.price_history[asset.symbol].index.duplicated(keep='first')].sort_index()
+            symbol        = self._alpaca_symbols[asset.symbol]
+            factor_future = self._pool.submit(self._fetch_factor_live, symbol, lookback)
+            price_future  = self._pool.submit(self._fetch_price_live, symbol, lookback)
+            futures.append((asset.symbol, factor_future, price_future))
+
+        for symbol, factor_future, price_future in futures:
+            self.history[symbol]       = self._append_new_rows(self.history[symbol], factor_future.result(), self.HISTORY_ROWS)
+            self.price_history[symbol] = self._append_new_rows(self.price_history[symbol], price_future.result(), self.PRICE_ROWS)
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from numba import njit
 
 COINS = [
 
@@ -20,6 +21,96 @@ COINS = [
 "XRP/USD",    #	Ripple (XRP)
 ]
 
+@njit('float64(float64[:], int64)', cache=True)
+def _last_zscore(arr, window):
+    """Z-score of the last element against the trailing `window` values.
+
+    Equivalent to standardize(df, window)[col].iloc[-1] for a single column,
+    without transforming the full frame. NaNs in the window are excluded
+    from the mean/std and the last *finite* value is scored, mirroring the
+    forward-fill the pandas path applied. Returns nan when fewer than
+    `window` observations are available. The explicit signature makes Numba
+    compile at import time instead of on the first live tick.
+    """
+    n = arr.shape[0]
+    if n < window:
+        return np.nan
+
+    start = n - window
+    count = 0
+    mean  = 0.0
+    for i in range(start, n):
+        if np.isnan(arr[i]):
+            continue
+        mean  += arr[i]
+        count += 1
+
+    if count < 2:
+        return np.nan
+    mean /= count
+
+    sq = 0.0
+    for i in range(start, n):
+        if np.isnan(arr[i]):
+            continue
+        d   = arr[i] - mean
+        sq += d * d
+    std = np.sqrt(sq / (count - 1))
+
+    if std == 0.0:
+        return np.nan
+
+    for i in range(n - 1, start - 1, -1):
+        if not np.isnan(arr[i]):
+            return (arr[i] - mean) / std
+    return np.nan
+
+@njit('float64(int64[:], float64[:], int64)', cache=True)
+def _daily_vol_last(timestamps, close, span0):
+    """Last value of the daily-return EWM std, computed in one compiled pass.
+
+    Equivalent to getDailyVol(close, span0).iloc[-1] but operates on raw
+    int64 nanosecond timestamps and a float64 close array so the per-minute
+    hot path skips pandas entirely. Non-finite returns (NaN closes, zero
+    denominators) are skipped rather than poisoning the accumulators; no
+    fastmath, since it would license the compiler to drop that NaN check.
+    """
+    day_ns = 86_400_000_000_000
+    n      = close.shape[0]
+    alpha  = 2.0 / (span0 + 1.0)
+    decay  = 1.0 - alpha
+
+    w_sum  = 0.0
+    w2_sum = 0.0
+    mean   = 0.0
+    t_sq   = 0.0
+    var    = np.nan
+
+    j = 0
+    for i in range(n):
+        target = timestamps[i] - day_ns
+        while j < n and timestamps[j] < target:
+            j += 1
+        if j == 0:
+            continue
+
+        ret    = close[i] / close[j - 1] - 1.0
+        if not np.isfinite(ret):
+            continue
+
+        w_sum  = decay * w_sum + 1.0
+        w2_sum = decay * decay * w2_sum + 1.0
+        t_sq   = decay * t_sq
+        delta  = ret - mean
+        mean  += delta / w_sum
+        t_sq  += delta * (ret - mean)
+
+        denom  = w_sum - w2_sum / w_sum
+        if denom > 0.0:
+            var = t_sq / denom
+
+    return np.sqrt(var)
+
 def getDailyVol(close,span0=100):
     df0=close.index.searchsorted(close.index-pd.Timedelta(days=1))
     df0=df0[df0>0]
@@ -52,8 +143,10 @@ def standardize(df, look_back, type='standard', dropna=True, drop_cols=False):
     if drop_cols:
         z_score.dropna(axis=1, thresh=( 0.7 * z_score.shape[0]), inplace=True)
 
+    z_score.ffill(inplace=True)
+
     if dropna:
-        return z_score.fillna(method ='ffill').dropna()
-    
-    return z_score.fillna(method ='ffill')
+        return z_score.dropna()
+
+    return z_score
 
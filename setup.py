@@ -25,7 +25,9 @@ setuptools.setup(
         'alpaca-trade-api',
         'alpaca-py',
         'lumnisfactors',
-        'tqdm'
+        'tqdm',
+        'numba',
+        'pyarrow'
 ],
     classifiers=[
         "Programming Language :: Python :: 3",